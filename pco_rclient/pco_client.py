@@ -27,34 +27,57 @@ __docformat__ = "restructuredtext en"
 
 
 from enum import Enum
-import inspect
-import ipaddress
+import functools
 import itertools
-import json
+import operator
 import os
-import pprint
 import re
-import requests
+import string
 import sys
+import threading
 import time
-import zmq
-import jsonschema
+from types import MappingProxyType
 from typing import TypedDict
-from jsonschema import validate
+
+
+try:
+    # optional, faster json (de)serialization
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+
+except ImportError:
+    import json
+
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+
+def _pprint(obj):
+    # pprint (which pulls in the dataclasses and inspect modules) is only
+    # imported once verbose output is requested
+    import pprint
+
+    pprint.pprint(obj)
+
+
+# names of the exceptions raised when the writer server does not respond
+_CONN_ERR_NAMES = frozenset(("ConnectionError", "ReadTimeout"))
 
 
 class NoTraceBackWithLineNumber(Exception):
     def __init__(self, msg):
-        if type(msg).__name__ in ["ConnectionError", "ReadTimeout"]:
+        if type(msg).__name__ in _CONN_ERR_NAMES:
             print(
                 "\n ConnectionError/ReadTimeout: it seems that the server "
                 "is not running (check xbl-daq-32 pco writer service "
                 "(pco_writer-pco{1-2}), ports, etc).\n"
             )
-        try:
-            ln = sys.exc_info()[-1].tb_lineno
-        except AttributeError:
-            ln = inspect.currentframe().f_back.f_lineno
+        tb = sys.exc_info()[2]
+        ln = tb.tb_lineno if tb is not None else sys._getframe(1).f_lineno
         self.args = (
             "{0.__name__} (line {1}): {2}".format(type(self), ln, msg),
         )
@@ -118,6 +141,102 @@ pco_config_schema = {
     },
 }
 
+# the schema is static, so its validator is built only once (on first use,
+# which keeps jsonschema out of the module import)
+_config_validator = None
+
+
+def _build_config_validator():
+    # returns a function telling whether a pco cam config is valid. The
+    # optional fastjsonschema (code generated, faster) is used if installed.
+    try:
+        import fastjsonschema
+    except ImportError:
+        import jsonschema
+
+        validator_class = jsonschema.validators.validator_for(
+            pco_config_schema
+        )
+        validator_class.check_schema(pco_config_schema)
+        return validator_class(pco_config_schema).is_valid
+
+    validate = fastjsonschema.compile(pco_config_schema)
+
+    def is_valid(jsonData):
+        try:
+            validate(jsonData)
+        except fastjsonschema.JsonSchemaException:
+            return False
+        return True
+
+    return is_valid
+
+
+# ip v4 pattern with no leading zeros and values up to 255
+_IP = (
+    r"(?:(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])\.){3}"
+    r"(?:25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])"
+)
+# hostname pattern requiring at least one (non-numeric AND non-period)-
+# character (to distinguish it from an ip address). The leading digits and
+# periods are disjoint from that character, so matching is linear in time.
+_HOST = r"[0-9.]*(?:[^\W\d]|-)[\w.\-]*"
+# ports with 4 or 5 digits. No check is done for max port number of 65535
+_PORT = r":[0-9]{4,5}"
+
+
+@functools.lru_cache(maxsize=None)
+def _network_pattern(protocol):
+    # compiles the network address pattern of a protocol, matching either an
+    # ip address or a hostname in a single pass. The protocol specifier ends
+    # with "://". e.g.: "https://". The pattern is meant to be used with
+    # fullmatch() and is cached per protocol. Http addresses may end with a
+    # slash.
+    end = "/?" if protocol in ("http", "https") else ""
+    return re.compile(
+        re.escape(protocol) + "://(?:" + _IP + "|" + _HOST + ")" + _PORT + end
+    )
+
+
+# regex matching a file number placeholder of "%d" or "%Nd" where N can be
+# any number of digits
+_PLACEHOLDER_RE = re.compile(r"%\d*d")
+
+
+def _validate_address(address, name, protocol, error):
+    # returns the address (without a trailing slash) if it is a valid network
+    # address of the given protocol (see validate_network_address), raises
+    # error otherwise
+    if _network_pattern(protocol).fullmatch(address):
+        return address.rstrip("/")
+    raise error(
+        f"Problem with the {name}:\n  {address} does not seem to be a valid address."
+    )
+
+
+# characters allowed in output file names (which must end with ".h5")
+_OUTFILE_ALLOWED = frozenset(string.ascii_letters + string.digits + "%./_-")
+
+
+def _is_nonneg_int(value):
+    # rule of the integer configuration items, shared (like the rules below)
+    # by the validate_* functions and PcoWriter.validate_configuration()
+    return isinstance(value, int) and value >= 0
+
+
+def _is_valid_dataset_name(dataset_name):
+    # rule of the dataset name
+    return isinstance(dataset_name, str) and dataset_name != ""
+
+
+def _is_valid_output_file(output_file):
+    # rule of the output file name (or file name template)
+    return (
+        isinstance(output_file, str)
+        and output_file.endswith(".h5")
+        and _OUTFILE_ALLOWED.issuperset(output_file)
+    )
+
 
 # Typed Statistics dictionary
 class StatisticsDict(TypedDict, total=False):
@@ -136,44 +255,53 @@ class StatisticsDict(TypedDict, total=False):
     writing_rate: float
 
 
+# keys of a complete statistics dictionary (in the order of StatisticsDict)
+_STAT_KEYS = (
+    'dataset_name', 'duration_sec', 'end_time', 'first_frame_id',
+    'n_frames', 'n_lost_frames', 'n_written_frames', 'output_file',
+    'start_time', 'status', 'success', 'user_id', 'writing_rate')
+_MANDATORY_STAT_KEYS = frozenset(_STAT_KEYS)
+# retrieves the values of all the statistics keys in one call
+_get_stat_values = operator.itemgetter(*_STAT_KEYS)
+
+
 def keys_in_dict(untyped_dict) -> bool:
     # Method to verify if the dictionary is complete
-    mandatory_keys = [
-        'dataset_name', 'duration_sec', 'end_time', 'first_frame_id',
-        'n_frames', 'n_lost_frames', 'n_written_frames', 'output_file',
-        'start_time', 'status', 'success', 'user_id', 'writing_rate']
-    keys_in_dict = untyped_dict.keys()
-    return all(key in keys_in_dict for key in mandatory_keys)
+    return untyped_dict.keys() >= _MANDATORY_STAT_KEYS
 
 
 def convert_to_typed_stat_dict(untyped_dict) -> StatisticsDict:
     # converts an untyped statistics dictionary to typed dictionary
     if keys_in_dict(untyped_dict):
-        return StatisticsDict(
-            dataset_name=untyped_dict['dataset_name'],
-            duration_sec=untyped_dict['duration_sec'],
-            end_time=untyped_dict['end_time'],
-            first_frame_id=int(untyped_dict['first_frame_id']),
-            n_frames=int(untyped_dict['n_frames']),
-            n_lost_frames=int(untyped_dict['n_lost_frames']),
-            n_written_frames=int(untyped_dict['n_written_frames']),
-            output_file=untyped_dict['output_file'],
-            start_time=untyped_dict['start_time'],
-            status=untyped_dict['status'],
-            success=bool(untyped_dict['success']),
-            user_id=untyped_dict['user_id'],
-            writing_rate=untyped_dict['writing_rate'],)
+        (dataset_name, duration_sec, end_time, first_frame_id, n_frames,
+         n_lost_frames, n_written_frames, output_file, start_time, status,
+         success, user_id, writing_rate) = _get_stat_values(untyped_dict)
+        # a TypedDict is a plain dict at runtime, the literal avoids the
+        # keyword call of StatisticsDict(...)
+        return {
+            'dataset_name': dataset_name,
+            'duration_sec': duration_sec,
+            'end_time': end_time,
+            'first_frame_id': int(first_frame_id),
+            'n_frames': int(n_frames),
+            'n_lost_frames': int(n_lost_frames),
+            'n_written_frames': int(n_written_frames),
+            'output_file': output_file,
+            'start_time': start_time,
+            'status': status,
+            'success': bool(success),
+            'user_id': user_id,
+            'writing_rate': writing_rate}
     # Typed conversion not possible
     return untyped_dict
 
 
 def validate_config(jsonData):
     # validates pco cam json config file based on the schema
-    try:
-        validate(instance=jsonData, schema=pco_config_schema)
-    except jsonschema.exceptions.ValidationError as err:
-        return False
-    return True
+    global _config_validator
+    if _config_validator is None:
+        _config_validator = _build_config_validator()
+    return _config_validator(jsonData)
 
 
 def insert_placeholder(string, index):
@@ -182,17 +310,13 @@ def insert_placeholder(string, index):
 
 
 def validate_connection_address(connection_address, name):
-    addr = validate_network_address(connection_address, protocol="tcp")
-    if addr:
-        return addr
-    raise PcoError(
-        f"Problem with the {name}:\n  {connection_address} does not seem to be a valid address"
-    )
+    return _validate_address(connection_address, name, "tcp", PcoError)
 
 
 def validate_dataset_name(dataset_name, name):
-    dataset_name = str(dataset_name)
-    if dataset_name != "":
+    if type(dataset_name) is not str:
+        dataset_name = str(dataset_name)
+    if _is_valid_dataset_name(dataset_name):
         return dataset_name
     raise PcoError(
         f"Problem with the {name} parameter: not a valid dataset name"
@@ -203,8 +327,9 @@ def validate_ip_address(ip_address):
     """
     Check whether the supplied string is a valid IP address.
 
-    The method will simply raise the exception from the ipaddress module if the
-    address is not valid.
+    An IP v4 address must consist of four dot-separated decimal numbers with
+    values up to 255 and without leading zeros. Any other address is checked
+    as an IP v6 address. A ValueError is raised if the address is not valid.
 
     Parameters
     ----------
@@ -218,10 +343,27 @@ def validate_ip_address(ip_address):
 
     """
 
-    if not type(ip_address) is type(""):
-        ip_address = ip_address.decode()
-    ip = ipaddress.ip_address(ip_address)
-    return str(ip)
+    if type(ip_address) is not str:
+        # ip addresses are ascii, a non-ascii input raises a ValueError too
+        ip_address = ip_address.decode("ascii")
+    parts = ip_address.split(".")
+    if len(parts) == 4 and all(
+        p.isascii()
+        and p.isdigit()
+        and len(p) <= 3
+        and int(p) < 256
+        and (p[0] != "0" or p == "0")
+        for p in parts
+    ):
+        return ip_address
+    # the (rare) ip v6 addresses are left to the ipaddress module
+    import ipaddress
+    try:
+        return str(ipaddress.IPv6Address(ip_address))
+    except ValueError:
+        raise ValueError(
+            f"{ip_address!r} does not appear to be an IPv4 or IPv6 address"
+        ) from None
 
 
 def validate_kill_response(writer_response, verbose=False):
@@ -246,6 +388,8 @@ def validate_network_address(network_address, protocol="tcp"):
       name (a host name must contain at least one alpha character)
     * The network address is terminated with a 4-5 digit port number preceeded
       by a colon. E.g.: ":8080"
+    * Nothing follows the port number, except a single slash for the http(s)
+      protocols.
 
     If all of these critera are met, the passed network address is returned
     again, otherwise the method returns None
@@ -266,50 +410,18 @@ def validate_network_address(network_address, protocol="tcp"):
 
     """
 
-    # ip v4 pattern with no leading zeros and values up to 255
-    ip_pattern = (
-        "(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\\.){3}"
-        "(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)"
-    )
-    # hostname pattern requiring at least one (non-numeric AND non-period)-
-    # character (to distinguish it from an ip address)
-    hostname_pattern = "[\\w.\\-]*[^0-9.][\\w.\\-]*"
-    # ports with 4 or 5 digits. No check is done for max port number of 65535
-    port_pattern = ":[0-9]{4,5}"
-    # protocol pattern end with "://". e.g.: "https://""
-    protocol_pattern = "%s:[/]{2}" % protocol
-
-    # check if address is given with an IP address
-    ip_find_pattern = f"(?<={protocol_pattern}){ip_pattern}(?={port_pattern})"
-    ip = re.findall(ip_find_pattern, network_address)
-    if ip:
-        try:
-            ip = validate_ip_address(ip[0])
-        except Exception as e:
-            raise PcoWarning(e)
-        connection_pattern = protocol_pattern + ip_pattern + port_pattern
-        if bool(re.match(connection_pattern, network_address)):
-            return network_address
-
-    # check if address is given with a hostname
-    hostname_find_pattern = (
-        f"(?<={protocol_pattern}){hostname_pattern}(?={port_pattern})"
-    )
-    hostname = re.findall(hostname_find_pattern, network_address)
-    if hostname:
-        if bool(
-            re.match(
-                protocol_pattern + hostname_pattern + port_pattern,
-                network_address,
-            )
-        ):
-            return network_address
+    # the address is given with either an IP address (the pattern only
+    # matches valid ip v4 addresses, so no further check is needed) or a
+    # hostname
+    if _network_pattern(protocol).fullmatch(network_address):
+        return network_address
     return None
 
 
 def validate_nonneg_int_parameter(parameter_int, name):
-    parameter_int = int(parameter_int)
-    if parameter_int >= 0:
+    if type(parameter_int) is not int:
+        parameter_int = int(parameter_int)
+    if _is_nonneg_int(parameter_int):
         return parameter_int
     raise PcoWarning(
         f"Problem with the {name} parameter: not a non-negative integer"
@@ -318,7 +430,7 @@ def validate_nonneg_int_parameter(parameter_int, name):
 
 def validate_output_file(output_file, name):
     output_file = os.path.expanduser(output_file)
-    if bool(re.match("[%./a-zA-Z0-9_-]*.h5", output_file)):
+    if _is_valid_output_file(output_file):
         return output_file
     raise PcoWarning("Problem with the output file name")
 
@@ -328,20 +440,40 @@ def validate_response(server_response, verbose=False):
 
 
 def validate_rest_api_address(rest_api_address, name):
-    addr = validate_network_address(rest_api_address, protocol="http")
-    if addr:
-        return addr
-    raise PcoWarning(
-        f"Problem with the {name}:\n  {rest_api_address} does not seem to be a valid address."
-    )
+    return _validate_address(rest_api_address, name, "http", PcoWarning)
 
 
 def validate_statistics_response(writer_response, verbose=False):
     return writer_response
 
 
-# Rest API routes.
-ROUTES = {
+# Default of the optional arguments for which None is a meaningful value.
+_UNSET = object()
+
+# Progress display: spinner characters and the terminal sequence returning to
+# the start of the line and clearing it.
+_SPINNER = ("-", "/", "|", "\\")
+_CLEAR_LINE = "\r\033[K"
+
+# Number of consecutive timed out status requests after which wait() gives up.
+_WAIT_MAX_TIMEOUTS = 5
+
+# Time [s] for which the response of the finished route is reused.
+_FINISHED_CACHE_TTL = 1.0
+
+# (connect, read) timeouts [s] of the requests controlling the writer.
+_CONTROL_TIMEOUT = (3.05, 10)
+
+# (connect, read) timeouts [s] of the statistics requests of a running writer.
+# They are polled while waiting, so a slow reply is rather reported as not
+# available than allowed to stall the progress display.
+_POLL_TIMEOUT = (3.05, 3)
+
+# Headers of the requests with a (utf-8 encoded) json body.
+_JSON_HEADERS = {"Content-Type": "application/json; charset=utf-8"}
+
+# Rest API routes (read-only).
+ROUTES = MappingProxyType({
     "start_pco": "/start_pco_writer",
     "status": "/status",
     "statistics": "/statistics",
@@ -352,7 +484,7 @@ ROUTES = {
     "server_uptime": "/server_uptime",
     "ack": "/ack",
     "finished": "/finished",
-}
+})
 
 
 class PcoWriter(object):
@@ -416,7 +548,9 @@ class PcoWriter(object):
             the `output_file` name) will be created. (default = 20000)
         config_file : str, optional
             The file path to the json configuration file of the pco cameras.
-            (default = '')
+            The file is only validated against the configuration schema if
+            `debug` is set or the environment variable PCO_VALIDATE_CONFIG is
+            "1". (default = '')
         cam : str, optional
             Camera identifier that can be used to load a specific configuration
             from the config_file. (default = '')
@@ -424,31 +558,90 @@ class PcoWriter(object):
             Debugger flag. (default = False)
         """
 
+        # a single session keeps the connections to the writer server alive
+        # between the (frequent) REST calls, e.g. when polling in wait()
+        import requests
+        from urllib3.util.retry import Retry
+        self._session = requests.Session()
+        # A GET answered with a transient gateway error is retried. Requests
+        # that failed to connect or to read a reply are not, so that a missing
+        # server is still reported after a single timeout, and so that a
+        # start (POST) is never sent twice. read=False passes a read timeout
+        # on as requests.Timeout instead of a ConnectionError. A Retry-After
+        # header of the error reply is ignored, it must not block the polling
+        # requests beyond their short timeouts.
+        retries = Retry(
+            total=2,
+            connect=0,
+            read=False,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(("GET",)),
+            backoff_factor=0.1,
+            raise_on_status=False,
+            respect_retry_after_header=False,
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4, pool_maxsize=8, max_retries=retries
+        )
+        # addresses from a camera config file are not restricted to http
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # cached configuration dict and its encoded json request body
+        self._configuration = None
+        self._configuration_key = None
+        self._config_body = None
+        # configuration items of the last successful validation
+        self._valid_fingerprint = None
+        # short-lived cache of the finished route's response
+        self._finished_cache = None
+        self._finished_cache_time = 0.0
+        self._finished_raw = None
+        # finished route response the previous statistics were converted from
+        self._statistics_source = None
+        # result of the last is_running() probe
+        self._running_cache = None
+        # only set from a camera config file here, see configure()
+        self.connection_address = None
+
         if cam == "":
-            self.flask_api_address = validate_rest_api_address(
-                flask_api_address, "flask_api_address"
+            self.flask_api_address = _validate_address(
+                flask_api_address, "flask_api_address", "http", PcoWarning
             )
-            self.writer_api_address = validate_rest_api_address(
-                writer_api_address, "writer_api_address"
+            self.writer_api_address = _validate_address(
+                writer_api_address, "writer_api_address", "http", PcoWarning
             )
         else:
             if config_file != "":
-                with open(config_file) as f:
-                    json_cam_dict = json.load(f)
-            if not validate_config(json_cam_dict):
-                raise NotAValidConfig("PCO configuration file not valid.")
-            cam_config = None
-            for camera in json_cam_dict["cameras"]:
-                if camera["name"] == cam:
-                    cam_config = camera
+                with open(config_file, "rb") as f:
+                    json_cam_dict = _loads(f.read())
+            # the config files are static deployment artifacts, so the full
+            # schema validation is only done on request. Otherwise, a
+            # malformed file shows up as missing items below.
+            if debug or os.environ.get("PCO_VALIDATE_CONFIG") == "1":
+                if not validate_config(json_cam_dict):
+                    raise NotAValidConfig("PCO configuration file not valid.")
+            try:
+                cam_config = None
+                for camera in json_cam_dict["cameras"]:
+                    if camera["name"] == cam:
+                        cam_config = camera
+                if cam_config is not None:
+                    flask_api_address = cam_config["flask_api_address"]
+                    writer_api_address = cam_config["writer_api_address"]
+                    connection_address = cam_config["connection_address"]
+            except (KeyError, TypeError) as e:
+                raise NotAValidConfig(
+                    "PCO configuration file not valid."
+                ) from e
             if cam_config is None:
                 raise CamNotFound(
                     f"Configuration for camera {cam} could not be found on the "
-                    "config file ({config_file})."
+                    f"config file ({config_file})."
                 )
-            self.flask_api_address = cam_config["flask_api_address"]
-            self.writer_api_address = cam_config["writer_api_address"]
-            self.connection_address = cam_config["connection_address"]
+            self.flask_api_address = flask_api_address
+            self.writer_api_address = writer_api_address
+            self.connection_address = connection_address
+        self._build_urls()
         if not self.is_connected():
             print("WARNING: The writer server is not responding!")
             print(
@@ -469,15 +662,19 @@ class PcoWriter(object):
 
         if debug:
             print("\nSetting debug configurations... \n")
-            self.flask_api_address = validate_rest_api_address(
-                "http://0.0.0.0:9901", "flask_api_address"
+            self.flask_api_address = _validate_address(
+                "http://0.0.0.0:9901", "flask_api_address", "http", PcoWarning
             )
-            self.writer_api_address = validate_rest_api_address(
-                "http://0.0.0.0:9555", "writer_api_address"
+            self.writer_api_address = _validate_address(
+                "http://0.0.0.0:9555", "writer_api_address", "http", PcoWarning
             )
-            self.connection_address = validate_connection_address(
-                "tcp://129.129.130.76:9999", "connection_address"
+            self.connection_address = _validate_address(
+                "tcp://129.129.130.76:9999",
+                "connection_address",
+                "tcp",
+                PcoError,
             )
+            self._build_urls()
             self.status = "unconfigured"
 
         elif self.is_running():
@@ -488,7 +685,7 @@ class PcoWriter(object):
                 "change the configuration using the configure() method.\n"
             )
             print("Current configuration:")
-            pprint.pprint(self.get_configuration())
+            _pprint(self.get_configuration())
         else:
             if output_file:
                 self.output_file = validate_output_file(
@@ -519,6 +716,188 @@ class PcoWriter(object):
             "service (pco_writer-pco{1-2})."
         )
 
+    def __del__(self):
+        self.close()
+
+    def _build_urls(self):
+        # pre-builds the request urls, so that no string concatenation is
+        # needed on every REST call. The ports are kept for the configuration.
+        self._flask_port = str(self.flask_api_address).split(":")[2]
+        self._writer_port = writer_port = (
+            str(self.writer_api_address).split(":")[2]
+        )
+        service_name = "pco_writer-pco2"
+        if self._flask_port == "9901":
+            service_name = "pco_writer-pco1"
+        self._url_ack = self.flask_api_address + ROUTES["ack"]
+        self._url_error = self.flask_api_address + ROUTES["error"]
+        self._url_finished = self.flask_api_address + ROUTES["finished"]
+        self._url_kill = self.writer_api_address + ROUTES["kill"]
+        self._url_server_log = (
+            self.flask_api_address + ROUTES["server_log"] + "/" + service_name
+        )
+        self._url_server_uptime = (
+            self.flask_api_address
+            + ROUTES["server_uptime"]
+            + "/"
+            + service_name
+        )
+        self._url_start = self.flask_api_address + ROUTES["start_pco"]
+        self._url_statistics = self.writer_api_address + ROUTES["statistics"]
+        self._url_status = (
+            self.flask_api_address + ROUTES["status"] + "/" + writer_port
+        )
+        self._url_stop = self.writer_api_address + ROUTES["stop"]
+        # the requests of the polling routes are prepared once and reused
+        self._prepared_finished = self._prepare_get(self._url_finished)
+        self._prepared_statistics = self._prepare_get(self._url_statistics)
+        self._prepared_status = self._prepare_get(self._url_status)
+
+    def _configuration_problem(self):
+        # returns the description of the first invalid configuration item,
+        # or None if the configuration is valid
+        if not _is_valid_output_file(self.output_file):
+            return "Problem with the output file name"
+        if not _is_valid_dataset_name(self.dataset_name):
+            return (
+                "Problem with the dataset_name parameter: not a valid "
+                "dataset name"
+            )
+        # the integer parameters were already converted when stored
+        for name in ("n_frames", "user_id", "max_frames_per_file"):
+            if not _is_nonneg_int(getattr(self, name)):
+                return (
+                    f"Problem with the {name} parameter: not a non-negative "
+                    "integer"
+                )
+        connection_address = self.connection_address
+        if not (
+            isinstance(connection_address, str)
+            and validate_network_address(connection_address, protocol="tcp")
+        ):
+            return (
+                "Problem with the connection_address:\n  "
+                f"{connection_address} does not seem to be a valid address"
+            )
+        return None
+
+    def _finished_response(self, get_response):
+        # returns the decoded response of the finished route, which is used
+        # by both the status and the statistics of the previous run and is
+        # therefore cached for a short time. get_response is only called to
+        # retrieve the (requests) response if the cache is outdated.
+        # An unchanged response is not decoded again, so that the previous
+        # statistics do not need to be converted again either.
+        if not self._finished_is_cached():
+            content = get_response().content
+            if self._finished_cache is None or content != self._finished_raw:
+                self._finished_cache = _loads(content)
+                self._finished_raw = content
+            self._finished_cache_time = time.monotonic()
+        return self._finished_cache
+
+    def _finished_is_cached(self):
+        # whether the cached response of the finished route is still valid
+        return (
+            self._finished_cache is not None
+            and time.monotonic() - self._finished_cache_time
+            <= _FINISHED_CACHE_TTL
+        )
+
+    def _poll_written_frames(self, nframes, progress, stop):
+        # polls the number of written frames for wait_nframes() until nframes
+        # are reached or stop is set. The latest number is stored in
+        # progress["nframes"], a raised exception in progress["error"].
+        get_written_frames = self.get_written_frames
+        # the polling interval is increased while no new frames are written
+        poll_interval = 0.1
+        try:
+            while not stop.is_set():
+                new_nframes = get_written_frames()
+                if (
+                    new_nframes is not None
+                    and int(new_nframes) > progress["nframes"]
+                ):
+                    progress["nframes"] = int(new_nframes)
+                    if progress["nframes"] >= nframes:
+                        return
+                    poll_interval = 0.1
+                else:
+                    poll_interval = min(poll_interval * 1.5, 1.0)
+                stop.wait(poll_interval)
+        except Exception as e:
+            progress["error"] = e
+
+    def _prepare_get(self, url):
+        # prepares a GET request which can be sent repeatedly by the session
+        import requests
+        return self._session.prepare_request(requests.Request("GET", url))
+
+    def _request_finished(self):
+        # sends the request of the finished route
+        return self._send(self._prepared_finished)
+
+    def _send(self, prepared, timeout=3):
+        # sends a prepared request, a missing connection to the writer server
+        # is raised as PcoError
+        import requests
+        try:
+            return self._session.send(prepared, timeout=timeout)
+        except requests.ConnectionError as e:
+            raise PcoError(
+                "The writer server seems to be disconnected and is not "
+                "responding.") from e
+
+    def _statistics_last_run(self, get_response, verbose):
+        # converts the response of the finished route to the statistics of
+        # the previous run, see _finished_response() for get_response
+        try:
+            response = self._finished_response(get_response)
+
+            if (
+                response is not self._statistics_source
+                or self.previous_statistics is None
+            ):
+                # an incomplete response is not converted, and the cached
+                # response must not be shared with the caller
+                self.previous_statistics = convert_to_typed_stat_dict(
+                    dict(response)
+                )
+                self._statistics_source = response
+
+            if verbose:
+                print("\nPCO writer statistics:\n")
+                _pprint(self.previous_statistics)
+                print("\n")
+            return dict(self.previous_statistics)
+        except Exception as e:
+            if verbose:
+                print(
+                    "PCO writer did not return a valid statistics "
+                    "response for the previous run."
+                )
+            return None
+
+    def _update_status(self, running, writer_status=None):
+        # updates and returns the status of the client instance for an
+        # already known running state of the writer, see get_status(). The
+        # writer status is only requested if it is needed and not given.
+        if running:
+            # A writer process is currently running
+            if self.status not in ("stopping", "killing"):
+                # return the status of the running writer
+                if writer_status is None:
+                    writer_status = self.get_status_writer()
+                self.status = writer_status
+            # If we are trying to stop or kill the writer and its still
+            # running, then report the fact that we are trying to stop/kill
+        elif self.status in ("receiving", "writing"):
+            # The last known status of the client was from a running writer
+            # process, so check on the writer status and return that
+            self.status = self.get_status_writer()
+        # Otherwise, return the status of the client object itself.
+        return self.status
+
     def assert_filenumber_placeholder(self):
         """
         Ensure that the output file name contains a file number placeholder if
@@ -531,13 +910,18 @@ class PcoWriter(object):
         """
 
         if self.max_frames_per_file <= self.n_frames:
-            # regex matching a pattern of "%d" or "%Nd" where N can be any
-            # number of digits
-            regexp = re.compile(r"%(\d|)+d")
-            if not regexp.search(self.output_file):
-                self.output_file = insert_placeholder(
-                    self.output_file, len(self.output_file) - 3
-                )
+            if not _PLACEHOLDER_RE.search(self.output_file):
+                # the (validated) output file name always ends with ".h5"
+                self.output_file = self.output_file[:-3] + "_%03d.h5"
+
+    def close(self):
+        """
+        Close the connections to the writer server.
+        """
+
+        session = getattr(self, "_session", None)
+        if session is not None:
+            session.close()
 
     def configure(
         self,
@@ -593,27 +977,36 @@ class PcoWriter(object):
         """
 
         if not self.is_running():
-            if output_file is not None:
+            # values equal to the current ones do not need to be validated
+            # again, see also validate_configuration() which only validates
+            # a changed configuration
+            if output_file is not None and output_file != self.output_file:
                 self.output_file = validate_output_file(
                     output_file, "output_file"
                 )
-            if dataset_name is not None:
+            if dataset_name is not None and dataset_name != self.dataset_name:
                 self.dataset_name = validate_dataset_name(
                     dataset_name, "dataset_name"
                 )
-            if n_frames is not None:
+            if n_frames is not None and n_frames != self.n_frames:
                 self.n_frames = validate_nonneg_int_parameter(
                     n_frames, "n_frames"
                 )
-            if user_id is not None:
+            if user_id is not None and user_id != self.user_id:
                 self.user_id = validate_nonneg_int_parameter(user_id, "user_id")
-            if max_frames_per_file is not None:
+            if (
+                max_frames_per_file is not None
+                and max_frames_per_file != self.max_frames_per_file
+            ):
                 self.max_frames_per_file = validate_nonneg_int_parameter(
                     max_frames_per_file, "max_frames_per_file"
                 )
-            if connection_address is not None:
-                self.connection_address = validate_connection_address(
-                    connection_address, "connection_address"
+            if (
+                connection_address is not None
+                and connection_address != self.connection_address
+            ):
+                self.connection_address = _validate_address(
+                    connection_address, "connection_address", "tcp", PcoError
                 )
             # sets configured and status initialized
             if self.validate_configuration():
@@ -621,7 +1014,7 @@ class PcoWriter(object):
                 self.status = "configured"
             if verbose:
                 print("\nUpdated PCO writer configuration:\n")
-                pprint.pprint(self.get_configuration())
+                _pprint(self.get_configuration())
                 conf_validity = (
                     "valid" if self.validate_configuration() else "NOT valid"
                 )
@@ -657,6 +1050,16 @@ class PcoWriter(object):
         """
         if self.is_running():
             return None
+        import zmq
+
+        packets_counter = 0
+        # the process-wide context (and its io thread) is reused between
+        # flushes, only the socket is created per flush
+        socket = zmq.Context.instance().socket(zmq.PULL)
+        # large receive queue and buffer to drain the stream at full speed
+        socket.setsockopt(zmq.RCVHWM, 100000)
+        socket.setsockopt(zmq.RCVBUF, 4 * 1024 * 1024)
+        socket.setsockopt(zmq.LINGER, 0)
         try:
             if verbose:
                 print("Flushing camera stream ... (Ctrl-C to stop)")
@@ -664,23 +1067,26 @@ class PcoWriter(object):
                     print(
                         f"Flush will terminate after {timeout} ms of inactivity on the data stream.")
 
-            context = zmq.Context()
-            socket = context.socket(zmq.PULL)
             socket.connect(self.connection_address)
-            packets_counter = 0
-            receiving = bool(socket.poll(timeout)) if timeout > 0 else True
-            while receiving:
-                string = socket.recv()
-                if packets_counter % 2 != 1 and verbose:
-                    d = json.loads(string.decode())
-                    print(packets_counter, d)
-                packets_counter += 1
-                if timeout > 0:
-                    receiving = bool(socket.poll(timeout))
-            socket.close()
-            context.term()
+            poller = zmq.Poller()
+            poller.register(socket, zmq.POLLIN)
+            poll_timeout = timeout if timeout > 0 else None
+            while poller.poll(poll_timeout):
+                # receive all the queued packets before polling again
+                while True:
+                    try:
+                        # the (image) data is not copied out of zmq
+                        frame = socket.recv(zmq.NOBLOCK, copy=False)
+                    except zmq.Again:
+                        break
+                    if verbose and packets_counter % 2 != 1:
+                        d = _loads(frame.bytes)
+                        print(packets_counter, d)
+                    packets_counter += 1
         except KeyboardInterrupt:
             pass
+        finally:
+            socket.close()
         return packets_counter
 
     def get_configuration(self, verbose=False):
@@ -699,49 +1105,73 @@ class PcoWriter(object):
             The current configuration of the PCO object.
         """
 
-        configuration_dict = {
-            "connection_address": self.connection_address,
-            "output_file": self.output_file,
-            "n_frames": str(self.n_frames),
-            "user_id": str(self.user_id),
-            "dataset_name": self.dataset_name,
-            "max_frames_per_file": str(self.max_frames_per_file),
-            "rest_api_port": str(self.flask_api_address).split(":")[2],
-            "n_modules": "1",
-            "writer_rest_port": str(self.writer_api_address).split(":")[2],
-            "flask_api_address": str(self.flask_api_address)
-        }
+        # the dict is only rebuilt if any of the configuration items changed
+        configuration_key = (
+            self.connection_address,
+            self.output_file,
+            self.n_frames,
+            self.user_id,
+            self.dataset_name,
+            self.max_frames_per_file,
+            self.flask_api_address,
+            self.writer_api_address,
+        )
+        if configuration_key != self._configuration_key:
+            self._configuration = {
+                "connection_address": self.connection_address,
+                "output_file": self.output_file,
+                "n_frames": str(self.n_frames),
+                "user_id": str(self.user_id),
+                "dataset_name": self.dataset_name,
+                "max_frames_per_file": str(self.max_frames_per_file),
+                "rest_api_port": self._flask_port,
+                "n_modules": "1",
+                "writer_rest_port": self._writer_port,
+                "flask_api_address": str(self.flask_api_address)
+            }
+            self._configuration_key = configuration_key
+            self._config_body = None
+        configuration_dict = dict(self._configuration)
         if verbose:
             print("\nPCO writer configuration:\n")
-            pprint.pprint(configuration_dict)
+            _pprint(configuration_dict)
             print("\n")
         return configuration_dict
 
-    def get_progress_message(self):
+    def get_progress_message(self, stats=_UNSET):
         """
         Return a string indicating the current progress of the writer.
+
+        Parameters
+        ----------
+        stats : dict or None, optional
+            Already retrieved writer statistics, or None if they are not
+            available. If not given, the statistics are requested from the
+            writer.
+
         """
 
-        stats = self.get_statistics()
+        if stats is _UNSET:
+            stats = self.get_statistics()
         if stats is None:
             msg = "Writer: Status not available"
         else:
-            status = stats.get("status", "unknown")
-            n_req = int(stats.get("n_frames", -1))
-            n_rcvd = int(stats.get("n_received_frames", 0))
-            n_wrtn = int(stats.get("n_written_frames", 0))
+            get = stats.get
+            status = get("status", "unknown")
+            n_req = int(get("n_frames", -1))
+            n_rcvd = int(get("n_received_frames", 0))
+            n_wrtn = int(get("n_written_frames", 0))
             if n_req > 0:
-                pc_rcvd = float(n_rcvd) / n_req * 100.0
-                pc_wrtn = float(n_wrtn) / n_req * 100.0
+                inv_n_req = 100.0 / n_req
                 msg = (
-                    "Writer: {}, #received: {:4d} ({:.1f}%), "
-                    "#written: {:4d} ({:.1f}%)".format(
-                        status, n_rcvd, pc_rcvd, n_wrtn, pc_wrtn
-                    )
+                    f"Writer: {status}, "
+                    f"#received: {n_rcvd:4d} ({n_rcvd * inv_n_req:.1f}%), "
+                    f"#written: {n_wrtn:4d} ({n_wrtn * inv_n_req:.1f}%)"
                 )
             else:
-                msg = "Writer: {}, #received: {:4d}, #written: {:4d}".format(
-                    status, n_rcvd, n_wrtn
+                msg = (
+                    f"Writer: {status}, #received: {n_rcvd:4d}, "
+                    f"#written: {n_wrtn:4d}"
                 )
         return msg
 
@@ -761,9 +1191,10 @@ class PcoWriter(object):
             The last error message from the writer or None (if not existant).
 
         """
-        request_url = self.flask_api_address + ROUTES["error"]
         try:
-            response = requests.get(request_url).json()
+            response = _loads(
+                self._session.get(self._url_error, timeout=3).content
+            )
             if "success" in response:
                 if verbose:
                     print("\nPCO writer error:")
@@ -790,14 +1221,10 @@ class PcoWriter(object):
             The last 10 lines of the writer server.
 
         """
-        service_name = "pco_writer-pco2"
-        if str(self.flask_api_address).split(":")[2] == "9901":
-            service_name = "pco_writer-pco1"
-        request_url = (
-            self.flask_api_address + ROUTES["server_log"] + "/" + service_name
-        )
         try:
-            response = requests.get(request_url).json()
+            response = _loads(
+                self._session.get(self._url_server_log, timeout=3).content
+            )
             if "success" in response:
                 if verbose:
                     print("\nPCO writer server log:")
@@ -823,17 +1250,12 @@ class PcoWriter(object):
             The uptime of the writer server service.
 
         """
-        service_name = "pco_writer-pco2"
-        if str(self.flask_api_address).split(":")[2] == "9901":
-            service_name = "pco_writer-pco1"
-        request_url = (
-            self.flask_api_address
-            + ROUTES["server_uptime"]
-            + "/"
-            + service_name
-        )
         try:
-            response = requests.get(request_url, data={"key": "uptime"}).json()
+            response = _loads(
+                self._session.get(
+                    self._url_server_uptime, data={"key": "uptime"}, timeout=3
+                ).content
+            )
             if "success" in response:
                 if verbose:
                     print("\nPCO writer server log:")
@@ -888,24 +1310,7 @@ class PcoWriter(object):
 
         """
 
-        request_url = self.flask_api_address + ROUTES["finished"]
-        try:
-            response = requests.get(request_url, timeout=3).json()
-
-            self.previous_statistics = convert_to_typed_stat_dict(response)
-
-            if verbose:
-                print("\nPCO writer statistics:\n")
-                pprint.pprint(self.previous_statistics)
-                print("\n")
-            return self.previous_statistics
-        except Exception as e:
-            if verbose:
-                print(
-                    "PCO writer did not return a valid statistics "
-                    "response for the previous run."
-                )
-            return None
+        return self._statistics_last_run(self._request_finished, verbose)
 
     def get_statistics_writer(self, verbose=False):
         """
@@ -925,13 +1330,17 @@ class PcoWriter(object):
 
         """
 
-        request_url = self.writer_api_address + ROUTES["statistics"]
+        import requests
         try:
-            response = requests.get(request_url).json()
+            response = _loads(
+                self._session.send(
+                    self._prepared_statistics, timeout=_POLL_TIMEOUT
+                ).content
+            )
             if validate_statistics_response(response):
                 if verbose:
                     print("\nPCO writer statistics:\n")
-                    pprint.pprint(response)
+                    _pprint(response)
                     print("\n")
                 return response
             if verbose:
@@ -940,7 +1349,7 @@ class PcoWriter(object):
                     "response"
                 )
             return None
-        except requests.ConnectionError:
+        except (requests.ConnectionError, requests.Timeout):
             # We expect a timeout error if the writer is not running, so return
             # None
             if verbose:
@@ -972,25 +1381,7 @@ class PcoWriter(object):
             (default = False)
         """
 
-        if self.is_running():
-            # A writer process is currently running
-            if self.status not in ("stopping", "killing"):
-                # return the status of the running writer
-                status = self.get_status_writer()
-                self.status = status
-            else:
-                # If we are trying to stop or kill the writer and its still
-                # running, then report the fact that we are trying to stop/kill
-                status = self.status
-        elif self.status in ("receiving", "writing"):
-            # The last known status of the client was from a running writer
-            # process, so check on the writer status and return that
-            status = self.get_status_writer()
-            self.status = status
-        else:
-            # Return the status of the client object itself.
-            status = self.status
-        return status
+        return self._update_status(self.is_running())
 
     def get_status_last_run(self):
         """
@@ -1012,20 +1403,17 @@ class PcoWriter(object):
 
         """
 
-        request_url = self.flask_api_address + ROUTES["finished"]
-        try:
-            response = requests.get(request_url, timeout=3).json()
-            return response["status"]
-        except requests.ConnectionError:
-            raise PcoError(
-                "The writer server seems to be disconnected and is "
-                "not responding."
-            )
+        return self._finished_response(self._request_finished)["status"]
 
-    def get_status_writer(self):
+    def get_status_writer(self, timeout=3):
         """
         Retrieve the status of the writer server.
 
+        Parameters
+        ----------
+        timeout : float, optional
+            The timeout [s] of the status request. (default = 3)
+
         Returns
         -------
         status : str
@@ -1033,19 +1421,8 @@ class PcoWriter(object):
 
         """
 
-        request_url = (
-            self.flask_api_address
-            + ROUTES["status"]
-            + "/"
-            + str(self.writer_api_address).split(":")[2]
-        )
-        try:
-            response = requests.get(request_url, timeout=3).json()
-            return response["status"]
-        except requests.ConnectionError as e:
-            raise PcoError(
-                "The writer server seems to be disconnected and is "
-                "not responding.") from e
+        response = _loads(self._send(self._prepared_status, timeout).content)
+        return response["status"]
 
     def get_written_frames(self):
         """
@@ -1074,32 +1451,36 @@ class PcoWriter(object):
         Verify whether a connection to the writer service is available.
         """
 
-        request_url = self.flask_api_address + ROUTES["ack"]
+        import requests
         try:
-            response = requests.get(request_url, timeout=3).json()
+            response = _loads(
+                self._session.get(self._url_ack, timeout=3).content
+            )
             if "success" in response:
                 return True
         except requests.ConnectionError:
             return False
         return False
 
-    def is_running(self):
+    def is_running(self, timeout=3):
         """
         Verify wether a writer process is currently running.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The timeout [s] of the status request. (default = 3)
+
         """
 
-        request_url = (
-            self.flask_api_address
-            + ROUTES["status"]
-            + "/"
-            + str(self.writer_api_address).split(":")[2]
-        )
-        try:
-            response = requests.get(request_url, timeout=3).json()
-            return response["status"] in ("receiving", "writing")
-        except requests.ConnectionError as e:
-            raise PcoError(
-                "The writer server seems to be disconnected and is not responding.") from e
+        response = _loads(self._send(self._prepared_status, timeout).content)
+        running = response["status"] in ("receiving", "writing")
+        if self._running_cache and not running:
+            # the writer stopped since the last probe, so the cached response
+            # of the finished route may still describe the run before
+            self._finished_cache = None
+        self._running_cache = running
+        return running
 
     def kill(self, verbose=False):
         """
@@ -1113,13 +1494,22 @@ class PcoWriter(object):
 
         """
 
+        import requests
         # check if writer is running before killing it
         response = 0
-        if self.is_running():
-            request_url = self.writer_api_address + ROUTES["kill"]
+        running = self.is_running()
+        if running:
+            running = None
             self.status = "killing"
+            # the previous run's response is outdated by this one
+            self._finished_cache = None
+            self._running_cache = None
             try:
-                response = requests.get(request_url).json()
+                response = _loads(
+                    self._session.get(
+                        self._url_kill, timeout=_CONTROL_TIMEOUT
+                    ).content
+                )
                 if validate_kill_response(response):
                     if verbose:
                         print("\nPCO writer process successfully killed.\n")
@@ -1135,7 +1525,10 @@ class PcoWriter(object):
                 "\nWriter is not running, impossible to kill(). Please "
                 "start it using the start() method.\n"
             )
-        self.status = self.get_status()
+        if running is None:
+            self.status = self.get_status()
+        else:
+            self.status = self._update_status(running)
         return response
 
     def reset(self):
@@ -1147,6 +1540,9 @@ class PcoWriter(object):
         self.flush_cam_stream(timeout=1000)
         self.last_run_id = 0
         self.previous_statistics = None
+        # kill() only drops the cached responses if a writer was running
+        self._finished_cache = None
+        self._running_cache = None
         self.status = (
             "configured" if self.validate_configuration() else "unconfigured"
         )
@@ -1162,12 +1558,14 @@ class PcoWriter(object):
             It waits for the writer to be running. (default = True)
         timeout : float, optional
             The maximum time [s] to wait for the writer to report a running
-            status. (default = 10)
+            status, and for the server to reply to the start request (at
+            least 5 s). (default = 10)
         verbose : bool, optional
             Show verbose information while starting the process.
             (default = False)
 
         """
+        import requests
         if not self.validate_configuration():
             raise PcoError(
                 "PCO writer is not properly configured! "
@@ -1175,12 +1573,23 @@ class PcoWriter(object):
                 "configure() command before you start()"
             )
         response = 0
+        # running state (and writer status) observed last, if known
+        running = None
+        writer_status = None
         if not self.is_running():
-            request_url = self.flask_api_address + ROUTES["start_pco"]
             try:
                 self.status = "starting"
-                data_json = json.dumps(self.get_configuration())
-                response = requests.post(request_url, data=data_json).json()
+                # the previous run's response is outdated by this one
+                self._finished_cache = None
+                self._running_cache = None
+                response = _loads(
+                    self._session.post(
+                        self._url_start,
+                        data=self._config_body,
+                        headers=_JSON_HEADERS,
+                        timeout=(_CONTROL_TIMEOUT[0], max(timeout, 5)),
+                    ).content
+                )
                 if validate_response(response):
                     self.last_run_id += 1
                     if verbose:
@@ -1190,28 +1599,42 @@ class PcoWriter(object):
                         )
                 elif verbose:
                     print(
-                        "\nPCO writer trigger start failed. Server response: {response}\n"
+                        f"\nPCO writer trigger start failed. Server response: {response}\n"
                     )
             except requests.ConnectionError as e:
                 raise PcoError(
                     "The writer server seems to be disconnected "
                     "and is not responding.") from e
 
-        elif verbose:
-            print(
-                "\nWriter is already running, impossible to start() " "again.\n"
-            )
+        else:
+            running = True
+            if verbose:
+                print(
+                    "\nWriter is already running, impossible to start() "
+                    "again.\n"
+                )
         # waits for is_running if wait=True
-        if "success" in response and wait:
+        if response != 0 and "success" in response and wait:
             timeout_limit = time.time() + timeout
-            while not self.is_running():
+            # short transitions are noticed quickly, longer ones are polled
+            # less often
+            poll_interval = 0.05
+            writer_status = self.get_status_writer()
+            running = writer_status in ("receiving", "writing")
+            while not running:
                 if time.time() > timeout_limit:
                     if verbose:
                         print(
                             f"WARNING!\n PCO writer did not report reaching the running state within the timeout of {timeout}s.")
                     break
-                time.sleep(0.15)
-        self.status = self.get_status()
+                time.sleep(poll_interval)
+                poll_interval = min(poll_interval * 2, 0.5)
+                writer_status = self.get_status_writer()
+                running = writer_status in ("receiving", "writing")
+        if running is None:
+            self.status = self.get_status()
+        else:
+            self.status = self._update_status(running, writer_status)
         return response
 
     def stop(self, wait=True, timeout=10, verbose=False):
@@ -1231,13 +1654,22 @@ class PcoWriter(object):
 
         """
 
+        import requests
         # check if writer is running before stopping it
         response = 0
-        if self.is_running():
-            request_url = self.writer_api_address + ROUTES["stop"]
+        running = self.is_running()
+        if running:
+            running = None
             self.status = "stopping"
+            # the previous run's response is outdated by this one
+            self._finished_cache = None
+            self._running_cache = None
             try:
-                response = requests.get(request_url).json()
+                response = _loads(
+                    self._session.get(
+                        self._url_stop, timeout=_CONTROL_TIMEOUT
+                    ).content
+                )
                 if validate_response(response):
                     if verbose:
                         print(
@@ -1246,7 +1678,7 @@ class PcoWriter(object):
                         )
                 else:
                     print(
-                        "\nPCO writer stop writer failed. Server response: {response} \n")
+                        f"\nPCO writer stop writer failed. Server response: {response} \n")
             except requests.ConnectionError as e:
                 raise PcoError(
                     "The writer server seems to be disconnected and is not responding.") from e
@@ -1259,7 +1691,11 @@ class PcoWriter(object):
         # waits for is_running if wait=True
         if response != 0 and "success" in response and wait:
             timeout_limit = time.time() + timeout
-            while self.is_running():
+            # short transitions are noticed quickly, longer ones are polled
+            # less often
+            poll_interval = 0.05
+            running = self.is_running()
+            while running:
                 if time.time() > timeout_limit:
                     print(
                         "WARNING!\n"
@@ -1267,8 +1703,13 @@ class PcoWriter(object):
                         "state within the timeout of {} s. ".format(timeout)
                     )
                     break
-                time.sleep(0.15)
-        self.status = self.get_status()
+                time.sleep(poll_interval)
+                poll_interval = min(poll_interval * 2, 0.5)
+                running = self.is_running()
+        if running is None:
+            self.status = self.get_status()
+        else:
+            self.status = self._update_status(running)
         return response
 
     def validate_configuration(self):
@@ -1283,29 +1724,29 @@ class PcoWriter(object):
 
         """
 
-        try:
-            assert self.output_file == validate_output_file(
-                self.output_file, "output_file"
-            )
-            assert self.dataset_name == validate_dataset_name(
-                self.dataset_name, "dataset_name"
-            )
-            assert self.n_frames == validate_nonneg_int_parameter(
-                self.n_frames, "n_frames"
-            )
-            assert self.user_id == validate_nonneg_int_parameter(
-                self.user_id, "user_id"
-            )
-            assert self.max_frames_per_file == validate_nonneg_int_parameter(
-                self.max_frames_per_file, "max_frames_per_file"
-            )
-            assert self.connection_address == validate_connection_address(
-                self.connection_address, "connection_address"
-            )
+        fingerprint = (
+            self.output_file,
+            self.dataset_name,
+            self.n_frames,
+            self.user_id,
+            self.max_frames_per_file,
+            self.connection_address,
+        )
+        if (
+            fingerprint == self._valid_fingerprint
+            and self._config_body is not None
+        ):
             return True
-        except Exception as e:
-            print(e)
+        problem = self._configuration_problem()
+        if problem is not None:
+            print(problem)
             return False
+        # encode the request body for start() once per configuration
+        configuration = self.get_configuration()
+        if self._config_body is None:
+            self._config_body = _dumps(configuration)
+        self._valid_fingerprint = fingerprint
+        return True
 
     def wait(self, verbose=False):
         """
@@ -1319,6 +1760,7 @@ class PcoWriter(object):
 
         """
 
+        import requests
         if not self.is_running():
             if verbose:
                 print("\nWriter is not running, nothing to wait().\n")
@@ -1327,17 +1769,53 @@ class PcoWriter(object):
         if verbose:
             print("Waiting for the writer to finish")
             print("  (Press Ctrl-C to stop waiting)")
-        spinner = itertools.cycle(["-", "/", "|", "\\"])
+        spinner = itertools.cycle(_SPINNER)
         msg = self.get_progress_message()
-        sys.stdout.write(msg)
-        sys.stdout.flush()
+        write = sys.stdout.write
+        flush = sys.stdout.flush
+        write(msg)
+        flush()
+        # local names for everything used in the polling loop
+        is_running = self.is_running
+        get_statistics_writer = self.get_statistics_writer
+        get_progress_message = self.get_progress_message
+        spin = spinner.__next__
+        sleep = time.sleep
+        timeout_error = requests.Timeout
+        # the polling interval is increased while the progress does not change
+        poll_interval = 0.1
+        n_timeouts = 0
         try:
-            while self.is_running():
-                msg = f"{self.get_progress_message()} {(next(spinner))}"
-                sys.stdout.write("\r\033[K")
-                sys.stdout.write(msg)
-                sys.stdout.flush()
-                time.sleep(0.1)
+            while True:
+                # the statistics of a running writer contain its status, so a
+                # single request per tick suffices while it is running. The
+                # status route is only asked once they are not available.
+                stats = get_statistics_writer()
+                if stats is None or stats.get("status") not in (
+                    "receiving",
+                    "writing",
+                ):
+                    try:
+                        running = is_running()
+                    except timeout_error:
+                        # a single slow reply does not end the wait, a server
+                        # that stopped replying does
+                        n_timeouts += 1
+                        if n_timeouts >= _WAIT_MAX_TIMEOUTS:
+                            raise
+                        continue
+                    if not running:
+                        break
+                n_timeouts = 0
+                progress_msg = get_progress_message(stats)
+                if progress_msg == msg:
+                    poll_interval = min(poll_interval * 1.5, 1.0)
+                else:
+                    poll_interval = 0.1
+                msg = progress_msg
+                write(f"{_CLEAR_LINE}{msg} {spin()}")
+                flush()
+                sleep(poll_interval)
         except KeyboardInterrupt:
             pass
         print("\n")
@@ -1405,31 +1883,41 @@ class PcoWriter(object):
         if verbose:
             print(f"Waiting for the writer to process {nframes} frames")
             print("  (Press Ctrl-C to stop waiting)")
-        spinner = itertools.cycle(["-", "/", "|", "\\"])
+        spinner = itertools.cycle(_SPINNER)
         new_nframes = self.get_written_frames()
         nframes_proc = int(new_nframes if new_nframes != None else 0)
-        perc_done = float(nframes_proc) * 100.0 / float(nframes)
-        msg = "Processed {} of {} frames ({:.1f}% done)".format(
-            nframes_proc, nframes, perc_done
+        perc_done = nframes_proc * 100.0 / nframes
+        msg = (
+            f"Processed {nframes_proc} of {nframes} frames "
+            f"({perc_done:.1f}% done)"
         )
-        sys.stdout.write(msg)
-        sys.stdout.flush()
+        write = sys.stdout.write
+        flush = sys.stdout.flush
+        write(msg)
+        flush()
         last_update_time = time.time()
         nframes_old = 0
+        # the writer is polled in a separate thread, so that slow requests do
+        # not stall the progress display (and vice versa)
+        progress = {"nframes": nframes_proc, "error": None}
+        stop_polling = threading.Event()
+        poller = threading.Thread(
+            target=self._poll_written_frames,
+            args=(nframes, progress, stop_polling),
+            daemon=True,
+        )
+        poller.start()
         try:
             while nframes_proc < nframes:
-                new_nframes = self.get_written_frames()
-                nframes_proc = int(
-                    new_nframes if new_nframes != None else nframes_proc
-                )
-                perc_done = float(nframes_proc) * 100.0 / float(nframes)
-                msg = "Processed {} of {} frames ({:.1f}% done)".format(
-                    nframes_proc, nframes, perc_done
+                if progress["error"] is not None:
+                    raise progress["error"]
+                nframes_proc = progress["nframes"]
+                perc_done = nframes_proc * 100.0 / nframes
+                write(
+                    f"{_CLEAR_LINE}Processed {nframes_proc} of {nframes} "
+                    f"frames ({perc_done:.1f}% done) {next(spinner)}"
                 )
-                msg1 = f"{msg} {(next(spinner))}"
-                sys.stdout.write("\r\033[K")
-                sys.stdout.write(msg1)
-                sys.stdout.flush()
+                flush()
                 if nframes_proc > nframes_old:
                     nframes_old = nframes_proc
                     last_update_time = time.time()
@@ -1441,9 +1929,12 @@ class PcoWriter(object):
                     print(
                         f"     Giving up after {inactivity_timeout} seconds of inactivity...")
                     return False
-                time.sleep(0.1)
+                time.sleep(0.125)
         except KeyboardInterrupt:
             pass
+        finally:
+            stop_polling.set()
+            poller.join()
 
         self.status = self.get_status()
 
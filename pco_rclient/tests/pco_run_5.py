@@ -1,6 +1,6 @@
 #!/bin/env python
 # -*- coding: UTF-8 -*-
-from epics import caput, caget
+from epics import ca
 import sys
 import time
 import getpass
@@ -75,23 +75,40 @@ COMMANDS = {
 # combines the IOCNAME:CMD for a epics command (caput/caget)
 def get_caput_cmd(ioc_name, command):
     return str(ioc_name+command)
+# channel access channels of the IOC commands (the pv name is built and the
+# channel connected once, on first use)
+channels = {}
+def get_channel(command):
+    if command not in channels:
+        channels[command] = ca.create_channel(
+            get_caput_cmd(ioc_name, COMMANDS[command]), connect=True)
+    return channels[command]
+# puts the (command, value) pairs without waiting for each of them, the puts
+# are sent to the IOC together
+def put_commands(*commands):
+    for command, value in commands:
+        ca.put(get_channel(command), value, wait=False)
+    ca.flush_io()
+    ca.pend_event(0.05)
 # starts the camera transfer
 def start_cam_transfer(n_frames):
-    caput(get_caput_cmd(ioc_name, COMMANDS["SAVESTOP"]), n_frames) # Sets the number of frames to transfer
-    caput(get_caput_cmd(ioc_name, COMMANDS["CAMERA"]), 1) # Starts the camera
+    put_commands(
+        ("SAVESTOP", n_frames), # Sets the number of frames to transfer
+        ("CAMERA", 1)) # Starts the camera
     time.sleep(1)
-    caput(get_caput_cmd(ioc_name, COMMANDS["FTRANSFER"]), 1) # Starts the transfer
+    put_commands(("FTRANSFER", 1)) # Starts the transfer
 # stops the camera transfer
 def stop_cam_transfer():
-    caput(get_caput_cmd(ioc_name, COMMANDS["CAMERA"]), 0) # Stops the camera
+    put_commands(("CAMERA", 0)) # Stops the camera
 # configures the camera
 def config_cam_transfer():
-    caput(get_caput_cmd(ioc_name, COMMANDS["CAMERA"]), 0)
-    caput(get_caput_cmd(ioc_name, COMMANDS["FILEFORMAT"]), 2)
-    caput(get_caput_cmd(ioc_name, COMMANDS["RECMODE"]), 0)
-    caput(get_caput_cmd(ioc_name, COMMANDS["STOREMODE"]), 1)
-    caput(get_caput_cmd(ioc_name, COMMANDS["CLEARMEM"]), 1)
-    caput(get_caput_cmd(ioc_name, COMMANDS["SET_PARAM"]), 1)
+    put_commands(
+        ("CAMERA", 0),
+        ("FILEFORMAT", 2),
+        ("RECMODE", 0),
+        ("STOREMODE", 1),
+        ("CLEARMEM", 1),
+        ("SET_PARAM", 1))
 
 ###############################
 #### SCRIPT USER VARIABLES ####
@@ -142,6 +159,16 @@ else:
 if pco_controller.is_running():
     pco_controller.stop()
 
+# waits until the writer reports one of the given statuses (or the timeout in
+# seconds expires) and returns the last reported status
+def wait_for_status(statuses, timeout):
+    timeout_limit = time.time() + timeout
+    status = pco_controller.get_status()
+    while status not in statuses and time.time() < timeout_limit:
+        time.sleep(0.05)
+        status = pco_controller.get_status()
+    return status
+
 
 problems = 0
 ok_flag = True
@@ -152,12 +179,14 @@ ok_flag = True
 print('\n\nTesting methods with a running writer - with start()\n\n')
 # updates the output_str with the current time
 output_str = get_datetime_now()
+# output file of all the runs below (the last run reuses it on purpose, to
+# fail on the taken dataset_name)
+output_file = os.path.join(outpath, 'test'+output_str+'.h5')
 # runs the writer for an unlimited number of frames
 nframes = 20
 # configure
 print ("pco_controller.configure...", end="")
-conf_dict = pco_controller.configure(output_file=os.path.join(
-    outpath, 'test'+output_str+'.h5'),user_id=user_id,
+conf_dict = pco_controller.configure(output_file=output_file, user_id=user_id,
     dataset_name="data", n_frames=nframes)
 
 # status = configured
@@ -182,8 +211,7 @@ else:
 
 # configure while running -> None
 print("pco_controller.configure... (after start)", end="")
-ret_configure = pco_controller.configure(output_file=os.path.join(
-    outpath, 'test'+output_str+'.h5'),user_id=user_id,
+ret_configure = pco_controller.configure(output_file=output_file, user_id=user_id,
     dataset_name="data", n_frames=nframes, max_frames_per_file=int(nframes/2))
 if ret_configure is not None:
     problems += 1
@@ -353,8 +381,7 @@ else:
 
 # configures it again with same dataset_name
 print ("pco_controller.configure... (with a taken dataset_name)", end="")
-conf_dict = pco_controller.configure(output_file=os.path.join(
-    outpath, 'test'+output_str+'.h5'),user_id=user_id,
+conf_dict = pco_controller.configure(output_file=output_file, user_id=user_id,
     dataset_name="data", n_frames=nframes)
 # status = configured
 if pco_controller.get_status() is not 'configured':
@@ -382,14 +409,15 @@ else:
     problems += 1
     
 # it will error out
-time.sleep(0.5)
 print("pco_controller.error...", end="")
-if pco_controller.get_status() == 'error':
+if wait_for_status(('error',), timeout=2.0) == 'error':
     print(' ✓')
 else:
     print(' ⨯')
     problems += 1
 
+# closes the connections to the writer server
+pco_controller.close()
 
 sys.exit(problems)
 
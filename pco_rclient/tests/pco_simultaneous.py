@@ -1,4 +1,6 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import multiprocessing
+import sys
 
 from pco_run import pco_test
 
@@ -15,16 +17,19 @@ writer_api_address_2 = 'http://xbl-daq-34:9556'
 ioc_name_2 = 'X02DA-CCDCAM2'
 cam_name_2 = 'pco2'
 
-process_list = [multiprocessing.Process(target=pco_test, args=(ioc_name_1,
-                                cam_name_1))]
-process_list.append(
-    multiprocessing.Process(target=pco_test, 
-                            args=(ioc_name_2,
-                                cam_name_2))
-)
+# the workers are forked from this (already initialized) process, and errors
+# of the tests are raised here instead of being lost in the child processes
+with ProcessPoolExecutor(
+        max_workers=2, mp_context=multiprocessing.get_context('fork')) as ex:
+    futures = [ex.submit(pco_test, ioc_name, cam_name)
+               for ioc_name, cam_name in ((ioc_name_1, cam_name_1),
+                                          (ioc_name_2, cam_name_2))]
+    problems = 0
+    for future in as_completed(futures):
+        try:
+            future.result()
+        except SystemExit as e:
+            # pco_test() exits with its number of problems
+            problems += e.code or 0
 
-for process in process_list:
-    process.start()
-
-for process in process_list:
-    process.join()
+sys.exit(problems)
@@ -9,5 +9,15 @@ setup(name='pco_rclient',
       url='https://github.com/paulscherrerinstitute/pco_rclient',
       license="GPL3",
       packages=['pco_rclient'],
-      include_package_data=True
+      include_package_data=True,
+      zip_safe=False,
+      python_requires='>=3.8',
+      # urllib3 >= 1.26 for the allowed_methods of the request retries
+      install_requires=['requests', 'urllib3>=1.26', 'pyzmq'],
+      extras_require={
+          # config file validation (only done in debug mode or on request)
+          'validation': ['jsonschema'],
+          # faster json (de)serialization and config file validation
+          'fast': ['orjson', 'fastjsonschema'],
+      }
       )